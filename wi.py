@@ -17,14 +17,23 @@
 
 """wi - job scheduling with weighted intervals"""
 
-import bisect
+import array
 import collections
+import heapq
 import io
+import itertools
 import math
 import operator
+import warnings
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    # Optional. (Not available in Pyodide, so the web version always uses
+    # the interpreted fallback.)
+    numba = None
 
 
 WeightedVertex = collections.namedtuple('WeightedVertex', ('vertex', 'weight'))
@@ -37,33 +46,116 @@ PathCostPair = collections.namedtuple('PathCostPair', ('path', 'cost'))
 PathCostPair.__doc__ = """A path through a graph, and its cost."""
 
 
+def _kahn_csr(indptr, indices, indegrees):
+    """
+    Linearizes a graph in CSR form by Kahn's algorithm.
+
+    Returns the vertices in a topological order, and how many were emitted.
+    (A count short of the total means the graph is cyclic; the caller is
+    responsible for treating that as an error.) The output array doubles as
+    the worklist: vertices behind the read cursor are already emitted, and
+    the stretch from there to the write cursor is the queue of current roots.
+    The indegrees array is consumed: it is decremented in place, so callers
+    must pass a scratch copy they do not need afterward.
+    """
+    order = indegrees.shape[0]
+    indegs = indegrees
+    tsort = np.empty(order, dtype=np.int32)
+
+    tail = 0
+    for vertex in range(order):
+        if indegs[vertex] == 0:
+            tsort[tail] = vertex
+            tail += 1
+
+    head = 0
+    while head < tail:
+        src = tsort[head]
+        head += 1
+
+        for edge in range(indptr[src], indptr[src + 1]):
+            dest = indices[edge]
+            indegs[dest] -= 1
+            if indegs[dest] == 0:
+                tsort[tail] = dest
+                tail += 1
+
+    return tsort, tail
+
+
+def _relax_csr(indptr, indices, weights, tsort):
+    """
+    Relaxes every edge of a CSR-form DAG in the given topological order.
+
+    Emits the parents forest of all max-cost paths from root vertices (with
+    -1 for "no parent") and the best cost ending at each vertex.
+    """
+    parents = np.full(weights.shape[0], -1, dtype=np.int32)
+    costs = weights.copy()
+
+    for position in range(tsort.shape[0]):
+        src = tsort[position]
+        for edge in range(indptr[src], indptr[src + 1]):
+            dest = indices[edge]
+            new_cost = costs[src] + weights[dest]
+            old_cost = costs[dest]
+
+            # Conditional selects, not a branch: relaxation outcomes are
+            # effectively random, so LLVM lowering these to cmov beats a
+            # mispredict-prone jump.
+            better = new_cost > old_cost
+            costs[dest] = new_cost if better else old_cost
+            parents[dest] = src if better else parents[dest]
+
+    return parents, costs
+
+
+if numba is not None:
+    _kahn_csr = numba.njit(cache=True)(_kahn_csr)
+    _relax_csr = numba.njit(cache=True)(_relax_csr)
+
+
 class IntGraph:
     """
     A vertex-weighted directed graph whose vertices are integers, numbered
     increasingly from 0. Supports finding a maximum-cost path ("diameter").
     """
 
-    __slots__ = ('_adj', '_indegrees', '_weights', '_size')
+    __slots__ = ('_adj', '_indegrees', '_weights', '_size',
+                 '_indptr', '_indices', '_presorted')
 
     def __init__(self):
         """Creates a graph with no vertices and no edges."""
+        # The per-vertex scalars are array.array, not list: they store the
+        # values unboxed (8 bytes per weight, a C int per indegree), so the
+        # traversals read dense memory instead of chasing PyObject pointers.
+        # Weights are kept as C doubles, so they come back as floats.
         self._adj = []
-        self._indegrees = []
-        self._weights = []
+        self._indegrees = array.array('i')
+        self._weights = array.array('d')
         self._size = 0
+        self._indptr = None
+        self._indices = None
+        self._presorted = False
 
     @property
     def order(self):
         """The number of vertices in the graph."""
-        return len(self._adj)
+        return len(self._weights)
 
     @property
     def size(self):
         """The number of edges in the graph."""
         return self._size
 
+    @property
+    def frozen(self):
+        """Whether the graph's topology has been frozen (see freeze)."""
+        return self._indptr is not None
+
     def add_vertex(self, weight):
         """Adds a vertex with the given weight. Returns the vertex."""
+        self._ensure_not_frozen()
         self._adj.append([])
         self._indegrees.append(0)
         self._weights.append(weight)
@@ -72,17 +164,63 @@ class IntGraph:
     def increase_weight(self, vertex, weight):
         """Increases the vertex's weight to the new weight, if larger."""
         self._ensure_exists(vertex)
-        self._weights[vertex] = max(self._weights[vertex], weight)
+        self._increase_weight_unchecked(vertex, weight)
 
     def add_edge(self, src, dest):
         """Adds a directed edge with the given endpoints."""
         self._ensure_exists(src)
         self._ensure_exists(dest)
+        self._add_edge_unchecked(src, dest)
+
+    def _increase_weight_unchecked(self, vertex, weight):
+        """Like increase_weight, for a vertex that is known to exist."""
+        self._weights[vertex] = max(self._weights[vertex], weight)
 
+    def _add_edge_unchecked(self, src, dest):
+        """
+        Like add_edge, for endpoints that are known to exist. Trusted callers
+        (such as Graph, whose key table only holds valid indices) use this to
+        skip two range checks per edge.
+        """
+        self._ensure_not_frozen()
         self._adj[src].append(dest)
         self._indegrees[dest] += 1
         self._size += 1
 
+    def freeze(self):
+        """
+        Converts the adjacency lists to CSR (compressed sparse row) form: one
+        int32 array of per-vertex offsets and one int32 array of all edge
+        destinations, in vertex order. Traversals then walk two contiguous
+        arrays rather than chasing a separate heap-allocated list per vertex,
+        and the edge storage shrinks to 4 bytes per edge. The graph's topology
+        becomes immutable: after freezing, no vertex or edge may be added.
+        Freezing an already-frozen graph does nothing.
+        """
+        if self.frozen:
+            return
+
+        self._indptr = np.fromiter(
+            itertools.accumulate(map(len, self._adj), initial=0),
+            dtype=np.int32, count=self.order + 1)
+        self._indices = np.fromiter(
+            itertools.chain.from_iterable(self._adj),
+            dtype=np.int32, count=self._size)
+        self._adj = None  # Allow the old adjacency lists to be collected.
+
+        # If every edge goes from a lower to a higher vertex -- true whenever
+        # the caller added vertices in a topologically consistent order --
+        # then 0, 1, ..., order - 1 is itself a topological sort, and queries
+        # can skip the Kahn pass. One vectorized check here buys that.
+        sources = np.repeat(np.arange(self.order, dtype=np.int32),
+                            np.diff(self._indptr))
+        self._presorted = bool((sources < self._indices).all())
+
+        # The indegrees exist to seed Kahn's algorithm, and once frozen they
+        # can be recounted from the CSR arrays on the rare query that needs
+        # them (none do, when presorted). Drop the stored copy.
+        self._indegrees = None
+
     def compute_max_cost_path(self):
         """
         Returns a path of maximal cost (total weight), and that cost. The graph
@@ -122,23 +260,53 @@ class IntGraph:
             raise ValueError("can't find max weight path in empty graph")
 
         parents, costs = self._compute_max_weight_paths_tree()
-        finish = max(range(self.order), key=lambda vertex: costs[vertex])
-        path = []
+        finish = int(np.argmax(costs))  # One C reduction, not n key calls.
 
+        # Walk the parents chain once to size the path, then fill a
+        # right-sized list back to front. This skips both the appends'
+        # geometric reallocations and the final reverse; the extra walk
+        # rereads entries that are already cache-hot.
+        length = 0
         dest = finish
-        while dest is not None:
-            path.append(dest)
+        while dest != -1:
+            length += 1
             dest = parents[dest]
 
-        path.reverse()
-        return PathCostPair(path=path, cost=costs[finish])
+        path = [0] * length
+        dest = finish
+        for slot in range(length - 1, -1, -1):
+            path[slot] = int(dest)  # int, not np.int32, from CSR traversal.
+            dest = parents[dest]
+
+        return PathCostPair(path=path, cost=float(costs[finish]))
 
     def _compute_max_weight_paths_tree(self):
         """
         Helper for compute_max_cost_path.
-        Emits the parents forest of all max-cost paths from root vertices.
+        Emits the parents forest of all max-cost paths from root vertices,
+        with -1 meaning "no parent" (the vertex starts a path).
         """
-        parents = [None] * self.order
+        if self.frozen:
+            # Both sweeps run as kernels over the CSR arrays (compiled, when
+            # Numba is present; see _kahn_csr and _relax_csr above).
+            if self._presorted:
+                # Ascending edges make the vertex numbering a topological
+                # sort (and prove acyclicity), so no Kahn pass is needed.
+                tsort = np.arange(self.order, dtype=np.int32)
+            else:
+                # A fresh count that the kernel is free to consume in place.
+                indegrees = np.bincount(
+                    self._indices, minlength=self.order).astype(np.int32)
+                tsort, count = _kahn_csr(self._indptr, self._indices,
+                                         indegrees)
+                if count != self.order:
+                    raise ValueError('cyclic graph cannot be topologically '
+                                     'sorted')
+
+            return _relax_csr(self._indptr, self._indices,
+                              np.asarray(self._weights), tsort)
+
+        parents = [-1] * self.order
         costs = self._weights[:]
 
         for src in self._kahn_toposort():
@@ -154,13 +322,20 @@ class IntGraph:
         """
         Linearizes (topologically sorts) the graph by Kahn's algorithm.
         (If the graph has a cycle, this detects it and throws an exception.)
+
+        Only the generic Graph/IntGraph path needs this. IntervalSet bypasses
+        it entirely: its compatibility DAG is already topologically ordered by
+        finish time, so it sorts once and runs its DP in that order.
         """
+        # The worklist is a plain list used as a stack: Kahn's algorithm is
+        # correct with any order among the current roots, and list
+        # append/pop is cheaper than deque rotation.
         tsort = []
         indegs = self._indegrees[:]
-        roots = collections.deque(self._find_roots())
+        roots = list(self._find_roots())
 
         while roots:
-            src = roots.popleft()
+            src = roots.pop()
 
             for dest in self._adj[src]:
                 indegs[dest] -= 1
@@ -179,6 +354,11 @@ class IntGraph:
         if not 0 <= vertex < self.order:
             raise ValueError(f'vertex {vertex} is out of range')
 
+    def _ensure_not_frozen(self):
+        """Throws an exception if the graph's topology is frozen."""
+        if self.frozen:
+            raise ValueError('frozen graph cannot be modified')
+
     def _find_roots(self):
         """Yields the vertices in the graph that have no incoming edges."""
         return (vertex for vertex, indeg in enumerate(self._indegrees)
@@ -211,6 +391,11 @@ class Graph:
         """Yields all vertex keys."""
         return iter(self._keys)
 
+    @property
+    def frozen(self):
+        """Whether the graph's topology has been frozen (see freeze)."""
+        return self._graph.frozen
+
     def add_vertex(self, key, weight):
         """Adds the key as a vertex with the given weight."""
         if key in self._table:
@@ -223,11 +408,21 @@ class Graph:
 
     def increase_weight(self, key, weight):
         """Increases the key's vertex's weight to the new weight, if larger."""
-        self._graph.increase_weight(self._table[key], weight)
+        # The table lookup itself proves the index is valid, so the range
+        # checks in the public IntGraph methods would be redundant here (and
+        # likewise in add_edge below).
+        self._graph._increase_weight_unchecked(self._table[key], weight)
 
     def add_edge(self, src, dest):
         """Adds a directed edge with the given endpoint keys."""
-        self._graph.add_edge(self._table[src], self._table[dest])
+        self._graph._add_edge_unchecked(self._table[src], self._table[dest])
+
+    def freeze(self):
+        """
+        Freezes the graph's topology, converting the adjacency representation
+        to CSR form. See IntGraph.freeze.
+        """
+        self._graph.freeze()
 
     def compute_max_cost_path(self):
         """
@@ -255,14 +450,72 @@ WeightedInterval = collections.namedtuple('WeightedInterval',
 WeightedInterval.__doc__ = """A weighted time interval."""
 
 
-MarkedWeightedInterval = collections.namedtuple(
-    'MarkedWeightedInterval',
-    ('start', 'finish', 'weight', 'mark'))
+# Shared sort key (element 0 of an interval tuple is its start). Building a
+# getter is not free, so key callables used on hot paths live here at module
+# scope rather than at each use site, and itemgetter is preferred to an
+# equivalent lambda (it runs with no frame).
+_BY_START = operator.itemgetter(0)
+
+
+def _predecessors(starts, finishes, by_start):
+    """
+    Computes, for each interval, how many intervals finish no later than it
+    starts (i.e., 1 + p(i); see IntervalSet). starts and finishes must be
+    sorted by finish time, and by_start must order those indices by start.
+
+    Visiting the intervals in start order makes the counts nondecreasing, so
+    one cursor sweeps the finishes array left to right exactly once. That is
+    O(n) with purely sequential reads, where a per-interval binary search
+    costs log n scattered probes each.
+    """
+    preds = np.empty(starts.shape[0], dtype=np.int64)
+    cursor = 0
+
+    for index in by_start:
+        start = starts[index]
+        while cursor < finishes.shape[0] and finishes[cursor] <= start:
+            cursor += 1
+        preds[index] = cursor
+
+    return preds
+
+
+def _wis_dp(predecessors, weights):
+    """
+    Runs the dynamic programming recurrence over finish-sorted intervals.
+
+    predecessors[i] must be 1 + p(i), where p(i) is the index of the last
+    interval that finishes no later than interval i starts (see IntervalSet).
+    Returns best, where best[i] is the maximum cost using only the first i
+    intervals, and take, where take[i] tells if an optimal subset of the first
+    i + 1 intervals schedules interval i.
+
+    This tight scalar loop is the solver's hot path, so it is JIT-compiled
+    with Numba when that is available (see below). The costs are carried in
+    the weights' own dtype, so all-integer weights get exact int64 arithmetic
+    and float64 weights get native FP; under Numba, each dtype gets its own
+    compiled specialization (generated and cached automatically on first use).
+    """
+    best = np.zeros(weights.shape[0] + 1, dtype=weights.dtype)
+    take = np.zeros(weights.shape[0], dtype=np.bool_)
+
+    for i in range(weights.shape[0]):
+        cost_skipping = best[i]
+        cost_taking = best[predecessors[i]] + weights[i]
+
+        # Conditional selects, not a branch (see _relax_csr).
+        taking = cost_taking > cost_skipping
+        best[i + 1] = cost_taking if taking else cost_skipping
+        take[i] = taking
 
-MarkedWeightedInterval.__doc__ = """
-A weighted time interval that carries a marking.
-This is used to specify if it should be highlighted in a plot.
-"""
+    return best, take
+
+
+if numba is not None:
+    # cache=True persists the compiled kernels, so the multi-second
+    # compilation is paid once per machine rather than once per process.
+    _predecessors = numba.njit(cache=True)(_predecessors)
+    _wis_dp = numba.njit(cache=True)(_wis_dp)
 
 
 class IntervalSet:
@@ -270,72 +523,156 @@ class IntervalSet:
     A collection of possibly overlapping positive-length weighted intervals.
 
     This data structure solves the weighted interval scheduling problem in
-    quadratic time. This is faster than the exponential-time brute-force
-    algorithm, but slower than an O(n log n) dynamic programming algorithm
-    given by Jon Kleinberg and Éva Tardos (*Algorithm Design*, pp. 252-260,
-    pub. 2006).
-
-    The quadratic algorithm implemented here first builds a vertex-weighted
-    directed acyclic graph whose vertices are intervals. The edge (u, v) is in
-    the graph iff u finishes no later than v starts. For n intervals, there are
-    up to n(n - 1) such edges, so this takes O(n**2) time. That takes place
-    incrementally as the user repeatedly calls add().
-
-    Then, the graph is topologically sorted and a path that maximizes total
-    weight is found. These operations are each linear in the size (number of
-    edges) of the graph. Finding a max-cost path -- which can also be regarded
-    as finding the "diameter" of the graph -- is similar to finding shortest
-    paths in a DAG. See IntGraph.compute_max_cost_path() for how this is done.
-    There are O(n**2) edges for n intervals, so this also takes O(n**2) time.
-    This happens when the user calls compute_max_cost_nonoverlapping_subset().
-
-    See ALGORITHM.md for a more detailed description of this algorithm, and its
-    conceptual connection to the faster algorithm by Kleinberg and Tardos.
+    O(n log n) time by the dynamic programming algorithm given by Jon Kleinberg
+    and Éva Tardos (*Algorithm Design*, pp. 252-260, pub. 2006). The intervals
+    are sorted by finish time, and for each interval i, binary search finds
+    p(i), the last interval that finishes no later than interval i starts. The
+    best cost using only the first i intervals (in sorted order) satisfies the
+    recurrence best(i) = max(best(i - 1), best(p(i)) + weight(i)), since an
+    optimal subset either skips interval i or takes it, and taking it excludes
+    every interval after p(i). The chosen subset is recovered by walking those
+    take/skip decisions backward.
+
+    This replaces a quadratic algorithm that represented the intervals as a
+    vertex-weighted DAG and found a max-cost path. That formulation remains
+    available through the Graph and IntGraph types, and is described in
+    ALGORITHM.md, along with its conceptual connection to the dynamic
+    programming algorithm implemented here.
     """
 
-    __slots__ = ('_graph',)
+    __slots__ = ('_starts', '_finishes', '_weights', '_table', '_cache')
 
     def __init__(self):
         """Creates an initially empty set of intervals."""
-        self._graph = Graph()
+        # The intervals are stored as three parallel lists (a "structure of
+        # arrays" layout), so the solver can hand them to NumPy wholesale.
+        self._starts = []
+        self._finishes = []
+        self._weights = []
+        self._table = {}  # Maps each distinct (start, finish) to its index.
+        self._cache = None  # The last solution, if nothing changed since.
 
     def add(self, start, finish, weight):
         """
         Adds a weighted interval from start to finish to the collection.
 
-        In the graph representation (see the class docstring), this adds edges
-        into the new interval from each interval that could be scheduled before
-        it, and out of the new interval to each interval that could be
-        scheduled after it.
+        A repeated interval does not appear twice; at most one of a group of
+        overlapping intervals can ever be scheduled, so only the heaviest
+        weight given for an interval is kept.
         """
         self._check_values(start, finish, weight)
-        new_interval = Interval(start, finish)
+        self._insert(start, finish, weight)
 
-        try:
-            self._graph.add_vertex(new_interval, weight)
-        except KeyError:
-            self._graph.increase_weight(new_interval, weight)
-            return  # Changing the weight doesn't add (or remove) any edges.
+    def add_many(self, weighted_intervals):
+        """
+        Adds many weighted intervals at once, given an (n, 3) array whose rows
+        are starts, finishes, and weights (as parse_lines produces).
+
+        This is equivalent to calling add on each row, but all the value
+        checks run as a few whole-column NumPy operations instead of several
+        Python-level calls per interval.
+        """
+        table = np.asarray(weighted_intervals, dtype=np.float64)
+        if table.ndim != 2 or table.shape[1] != 3:
+            raise ValueError('need rows of start, finish and weight values')
+
+        # Whole-column checks; on failure, np.argmin of the boolean mask
+        # pinpoints the first offending row for the message.
+        finite = np.isfinite(table).all(axis=1)
+        if not finite.all():
+            raise ValueError(
+                f'non-finite interval value (row {int(np.argmin(finite))})')
+
+        with np.errstate(over='ignore'):  # Overflow is reported just below.
+            durations = table[:, 1] - table[:, 0]
+
+        finite = np.isfinite(durations)
+        if not finite.all():
+            raise ValueError('interval has non-finite duration '
+                             f'(row {int(np.argmin(finite))})')
+
+        positive = durations > 0
+        if not positive.all():
+            raise ValueError('interval has nonpositive duration '
+                             f'(row {int(np.argmin(positive))})')
+
+        positive = table[:, 2] > 0
+        if not positive.all():
+            raise ValueError(
+                f'nonpositive weight (row {int(np.argmin(positive))})')
+
+        for start, finish, weight in table.tolist():
+            self._insert(start, finish, weight)
+
+    def _insert(self, start, finish, weight):
+        """Records an already-validated weighted interval."""
+        # A plain tuple key: it hashes and compares the same as an Interval,
+        # but costs about half as much to construct, and repeat adds (weight
+        # bumps) throw the key away immediately.
+        key = (start, finish)
+
+        index = self._table.get(key)
+        if index is None:
+            self._table[key] = len(self._weights)
+            self._starts.append(start)
+            self._finishes.append(finish)
+            self._weights.append(weight)
+        elif self._weights[index] < weight:
+            self._weights[index] = weight
+        else:
+            return  # Nothing changed, so any cached solution still holds.
 
-        for old_interval in self._graph.vertices:
-            if finish <= old_interval.start:
-                self._graph.add_edge(new_interval, old_interval)
-            elif old_interval.finish <= start:
-                self._graph.add_edge(old_interval, new_interval)
+        self._cache = None
 
     def compute_max_cost_nonoverlapping_subset(self):
         """
         Solves the weighted job scheduling problem on the intervals. Running
-        time is quadratic in the number of intervals.
+        time is O(n log n) in the number of intervals.
 
-        See the class docstring for details on the algorithm.
+        See the class docstring for details on the algorithm. Repeated calls
+        with no intervening mutation reuse the previous solution.
         """
-        graph_path, cost = self._graph.compute_max_cost_path()
+        if self._cache is not None:
+            # A fresh path list, so mutating one result can't taint another.
+            return PathCostPair(path=list(self._cache.path),
+                                cost=self._cache.cost)
 
-        weighted_intervals = [WeightedInterval(*interval, weight=weight)
-                              for interval, weight in graph_path]
+        if not self._weights:
+            raise ValueError("can't solve scheduling with no intervals")
 
-        return PathCostPair(path=weighted_intervals, cost=cost)
+        order = np.argsort(self._finishes, kind='stable')
+        starts = np.array(self._starts)[order]
+        finishes = np.array(self._finishes)[order]
+
+        # All-integer weights keep an integer dtype, for an exact integer
+        # cost; anything else is solved in float64.
+        weights = np.array(self._weights)
+        if not np.issubdtype(weights.dtype, np.integer):
+            weights = weights.astype(np.float64, copy=False)
+        weights = weights[order]
+
+        # predecessors[i] is the number of intervals an optimal subset may
+        # still draw from if it schedules interval i (i.e., 1 + p(i)).
+        by_start = np.argsort(starts, kind='stable')
+        predecessors = _predecessors(starts, finishes, by_start)
+
+        best, take = _wis_dp(predecessors, weights)
+
+        path = []
+        i = len(order)
+        while i > 0:
+            if take[i - 1]:
+                index = int(order[i - 1])
+                path.append(WeightedInterval(self._starts[index],
+                                             self._finishes[index],
+                                             self._weights[index]))
+                i = predecessors[i - 1]
+            else:
+                i -= 1
+
+        path.reverse()
+        self._cache = PathCostPair(path=path, cost=best[len(order)].item())
+        return PathCostPair(path=list(path), cost=self._cache.cost)
 
     @staticmethod
     def _check_values(start, finish, weight):
@@ -357,33 +694,6 @@ class IntervalSet:
             raise ValueError(f'nonpositive weight {weight:g}')
 
 
-class MappedView:
-    """
-    A mapped read-only view of a list.
-
-    This enables bisect_left and bisect/bisect_right to use custom keys.
-    """
-
-    __slots__ = ('_elems', '_mapper')
-
-    def __init__(self, elems, mapper):
-        """Creates a view of elems via mapper."""
-        self._elems = elems
-        self._mapper = mapper
-
-    def __bool__(self):
-        """Tells if the list has any elements."""
-        return bool(self._elems)
-
-    def __len__(self):
-        """Returns the number of elements in the list."""
-        return len(self._elems)
-
-    def __getitem__(self, index):
-        """Gets the mapped value at the given index."""
-        return self._mapper(self._elems[index])
-
-
 class Plotter:
     """Visualizes all input intervals, with solution intervals colored."""
 
@@ -401,82 +711,109 @@ class Plotter:
     BAR_COLOR = 'gray'
     HIGHLIT_BAR_COLOR = 'green'
 
-    __slots__ = ('_rows', '_min_start', '_max_finish')
+    __slots__ = ('_pending', '_min_start', '_max_finish')
 
     def __init__(self):
         """Creates a new plotter, initially holding no intervals."""
-        self._rows = []
+        self._pending = []
         self._min_start = math.inf
         self._max_finish = -math.inf
 
     def add(self, weighted_interval, highlight):
         """
-        Adds an interval to be plotted in the first row where it fits.
+        Adds an interval -- any (start, finish, weight) triple -- to be
+        plotted.
 
-        This can take time linear in the number of intervals added so far. So
-        to add all intervals takes quadratic time (like the solving algorithm).
-        See _try_intervals below.
+        Intervals are just buffered here, in constant time per call; they are
+        laid out in rows when plot is called. See _assign_rows below. The
+        buffer holds plain tuples: nothing downstream needs named fields, and
+        a tuple is markedly cheaper to build than a namedtuple.
         """
-        if weighted_interval.start >= weighted_interval.finish:
-            raise ValueError('refusing to plot nonpositive-duration interval')
-
-        self._min_start = min(self._min_start, weighted_interval.start)
-        self._max_finish = max(self._max_finish, weighted_interval.finish)
+        start, finish, weight = weighted_interval
 
-        mwi = MarkedWeightedInterval(*weighted_interval, mark=highlight)
+        if start >= finish:
+            raise ValueError('refusing to plot nonpositive-duration interval')
 
-        for row in self._rows:
-            if self._try_insert(row, mwi):
-                return
+        # Inline compares: the min and max builtins cost a call per add.
+        if start < self._min_start:
+            self._min_start = start
+        if finish > self._max_finish:
+            self._max_finish = finish
 
-        self._rows.append([mwi])
+        self._pending.append((start, finish, weight, highlight))
 
     # TODO: Annotate weights.
     def plot(self):
         """Creates a plot of all added intervals, as SVG code."""
-        fig, ax = self._initialize_plot()
+        # Deferred so importing wi doesn't pay Matplotlib's startup cost;
+        # solving without plotting never needs it. (After the first call,
+        # these are just lookups in sys.modules.)
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PatchCollection
+        from matplotlib.patches import Rectangle
 
-        for i, row in enumerate(self._rows):
-            for start, finish, _weight, highlight in row:
-                bc = (self.HIGHLIT_BAR_COLOR if highlight else self.BAR_COLOR)
+        rows = self._assign_rows()
+        fig, ax = self._initialize_plot(len(rows))
 
-                ax.add_patch(Rectangle(
-                    xy=(start, i + self.TOP_MARGIN),
-                    width=(finish - start), height=self.BAR_HEIGHT,
-                    edgecolor=self.BORDER_COLOR, facecolor=bc,
-                    lw=self.BORDER_THICKNESS))
+        bars = []
+        bar_colors = []
 
-        with io.StringIO() as dump:
-            fig.savefig(dump, format='svg', bbox_inches='tight')
-            return dump.getvalue()
+        for i, row in enumerate(rows):
+            for start, finish, _weight, highlight in row:
+                bars.append(Rectangle(
+                    xy=(start, i + self.TOP_MARGIN),
+                    width=(finish - start), height=self.BAR_HEIGHT))
+                bar_colors.append(self.HIGHLIT_BAR_COLOR if highlight
+                                  else self.BAR_COLOR)
+
+        # A single collection draws all the bars in one pass, where adding
+        # each Rectangle as its own patch would restyle and redraw per bar.
+        ax.add_collection(PatchCollection(
+            bars, facecolors=bar_colors, edgecolor=self.BORDER_COLOR,
+            lw=self.BORDER_THICKNESS))
+
+        # BytesIO skips encoding text through StringIO; the decode at the
+        # boundary is the only str conversion. Closing the figure keeps it
+        # from accumulating in pyplot's global registry across calls.
+        try:
+            with io.BytesIO() as dump:
+                fig.savefig(dump, format='svg', bbox_inches='tight')
+                return dump.getvalue().decode('utf-8')
+        finally:
+            plt.close(fig)
 
-    @staticmethod
-    def _try_insert(row, interval):
+    def _assign_rows(self):
         """
-        Inserts an interval into a row if it would not overlap with any
-        interval already there. This takes time linear in the size of the row
-        if an insertion is performed, and logarithmic time otherwise.
-
-        Implementation note: This is called repeatedly in such a way that
-        binary search (bisect.bisect_right) may afford no asymptotic speedup
-        overall, as many intervals may be placed (before others) in the same
-        row. Nonetheless, insertion into a large row is actually the case I am
-        thinking of in using binary search. A sequence of comparisons -- each
-        dereferencing a pointer to access a Python object -- is usually slower,
-        by a constant factor, than moving contiguous memory. (This rationale is
-        analogous to the reason one might sometimes use bisect.insort.)
+        Lays out the intervals in rows so that no two intervals in a row
+        overlap, in O(n log n) time.
+
+        This sweeps the intervals in start order, keeping a min-heap of rows
+        keyed by the finish time of each row's last interval. The new interval
+        goes at the end of the row that has been idle longest, if that row is
+        free by the time the interval starts, and on a new row otherwise.
+        (Since the sweep is in start order, if the longest-idle row is not
+        free, no row is.) Each interval costs one heap pop and/or push, versus
+        the previous scheme's linear probe of every existing row.
         """
-        finish_times = MappedView(row, operator.attrgetter('finish'))
-        index = bisect.bisect_right(finish_times, interval.start)
+        rows = []
+        heap = []  # Pairs of each row's last finish time and its index.
 
-        if index == len(row) or interval.finish <= row[index].start:
-            row.insert(index, interval)
-            return True
+        for marked in sorted(self._pending, key=_BY_START):
+            if heap and heap[0][0] <= marked[0]:  # Compare to the start.
+                _, index = heapq.heappop(heap)
+                rows[index].append(marked)
+            else:
+                index = len(rows)
+                rows.append([marked])
 
-        return False
+            heapq.heappush(heap, (marked[1], index))  # Key on the finish.
 
-    def _initialize_plot(self):
+        return rows
+
+    def _initialize_plot(self, row_count):
         """Creates and returns our customized Figure and Axes objects."""
+        import matplotlib.pyplot as plt  # Deferred; see plot above.
+
         x_range = self._compute_x_range()  # Do this first, to fail sooner.
 
         fig, ax = plt.subplots()
@@ -485,13 +822,14 @@ class Plotter:
         fig.set_figheight(self.FIGURE_HEIGHT)
 
         self._style_axes(ax)
-        self._set_axes_geometry(ax, x_range * self.X_PADDING_FRACTION)
+        self._set_axes_geometry(ax, x_range * self.X_PADDING_FRACTION,
+                                row_count)
 
         return fig, ax
 
     def _compute_x_range(self):
         """Checks there are intervals to plot and computes the x-range."""
-        if not self._rows:
+        if not self._pending:
             # TODO: Should this really be an IndexError?
             raise IndexError('no intervals to plot')
 
@@ -515,68 +853,94 @@ class Plotter:
 
         ax.yaxis.set_visible(False)
 
-    def _set_axes_geometry(self, ax, x_padding):
+    def _set_axes_geometry(self, ax, x_padding, row_count):
         """Applies custom range and orientation for the axes."""
         ax.set_xlim(xmin=(self._min_start - x_padding),
                     xmax=(self._max_finish + x_padding))
 
         ax.set_ylim(ymin=-self.Y_PADDING,
-                    ymax=(len(self._rows) + self.Y_PADDING))
+                    ymax=(row_count + self.Y_PADDING))
 
         ax.invert_yaxis()
 
 
 def parse_lines(lines):
-    """Parses lines of triples of numbers to weighted intervals."""
-    for line in lines:
-        comment_index = line.find('#')
-        uncommented = (line if comment_index < 0 else line[:comment_index])
+    """
+    Parses lines of triples of numbers to an (n, 3) array whose rows are
+    weighted intervals. Blank lines, and "#" comments, are skipped.
 
-        tokens = uncommented.split()
-        if not tokens:
-            continue
+    np.loadtxt tokenizes and converts the whole input in C, which is much
+    faster than splitting each line and calling float() per token in Python.
+    """
+    try:
+        with warnings.catch_warnings():
+            # Input of nothing but comments and blank lines is not an error
+            # here (the solver reports it downstream), so don't warn on it.
+            warnings.filterwarnings(
+                'ignore', message='loadtxt: input contained no data')
+            table = np.loadtxt(lines, comments='#', dtype=np.float64, ndmin=2)
+    except ValueError as error:
+        raise ValueError(f'bad interval: {error}') from error
 
-        if len(tokens) != 3:
-            raise ValueError(f'bad interval: need 3 values, got {len(tokens)}')
+    if table.size == 0:
+        return table.reshape(0, 3)
 
-        yield WeightedInterval._make(map(float, tokens))
+    if table.shape[1] != 3:
+        raise ValueError(
+            f'bad interval: need 3 values, got {table.shape[1]}')
+
+    return table
 
 
 def do_solve(weighted_intervals):
-    """Core solving helper, for solve_text_input."""
+    """Core solving helper, for solve_text_input. Takes interval rows."""
     interval_set = IntervalSet()
-    for start, finish, weight in weighted_intervals:
-        interval_set.add(start, finish, weight)
-
+    interval_set.add_many(weighted_intervals)
     return interval_set.compute_max_cost_nonoverlapping_subset()
 
 
-def build_plotter(all_weighted_intervals, weighted_intervals_to_highlight):
-    """Plotter-building helper, for solve_text_input."""
-    need_marks = set(weighted_intervals_to_highlight)
+def build_plotter(all_weighted_intervals, indices_to_highlight):
+    """
+    Plotter-building helper, for solve_text_input.
+
+    Intervals to highlight are identified by their positions in
+    all_weighted_intervals, so each check is an integer set lookup rather than
+    a hash of a tuple of floats.
+    """
     plotter = Plotter()
 
-    for weighted_interval in all_weighted_intervals:
-        if weighted_interval in need_marks:
-            plotter.add(weighted_interval, highlight=True)
-            need_marks.remove(weighted_interval)
-        else:
-            plotter.add(weighted_interval, highlight=False)
+    for index, weighted_interval in enumerate(all_weighted_intervals):
+        plotter.add(weighted_interval,
+                    highlight=(index in indices_to_highlight))
 
     return plotter
 
 
-def solve_text_input(lines):
+def solve_text_input(lines, render_plot=True):
     """
     Solves weighted job scheduling. Takes line-based input. Returns line-based
     and SVG plot output. (The web version uses this; see bridge.js.)
+
+    Callers that only want the textual solution can pass render_plot=False to
+    skip the plotting work entirely; the SVG slot of the result is then None.
     """
-    weighted_intervals = list(parse_lines(lines))
-    path, cost = do_solve(weighted_intervals)
+    table = parse_lines(lines)
+    path, cost = do_solve(table)
     path_lines = [f'{interval.start:g} {interval.finish:g} {interval.weight:g}'
                   for interval in path]
 
-    svg_plot = build_plotter(weighted_intervals, path).plot()
+    if not render_plot:
+        return path_lines, cost, None
+
+    rows = [tuple(row) for row in table.tolist()]
+    first_occurrences = {}
+    for index, row in enumerate(rows):
+        first_occurrences.setdefault(row, index)
+    # A namedtuple hashes and compares like the equal plain tuple, so the
+    # path's WeightedIntervals look up their input rows directly.
+    highlight_indices = {first_occurrences[interval] for interval in path}
+
+    svg_plot = build_plotter(rows, highlight_indices).plot()
 
     return path_lines, cost, svg_plot
 